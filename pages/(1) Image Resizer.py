@@ -1,5 +1,7 @@
 import io
+import os
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Tuple
 
@@ -23,27 +25,94 @@ uploaded_files = st.file_uploader(
     type=["png", "jpg", "jpeg", "webp", "bmp", "tiff"],
     accept_multiple_files=True)
 
+# These formats are already compressed by their encoders; deflating them again only burns CPU
+_STORED_EXTS = (".jpg", ".png", ".webp")
+
+# Map common extensions to PIL save formats
+_FMT_MAP = {
+    "jpg": "JPEG",
+    "jpeg": "JPEG",
+    "png": "PNG",
+    "webp": "WEBP",
+    "bmp": "BMP",
+    "tif": "TIFF",
+    "tiff": "TIFF",
+}
+
+# 16-bit modes Image.reduce() rejects
+_NO_REDUCE_MODES = ("I;16", "I;16B", "I;16L", "I;16N")
+
+# Cap per run; each worker holds a full-size decode
+_MAX_WORKERS = 4
+
+# Path separators -> "_"
+_SAFE_TABLE = str.maketrans({"/": "_", "\\": "_"})
+
 def _safe_name(name: str) -> str:
     # Keep it simple and filesystem-safe
-    return name.replace("/", "_").replace("\\", "_").strip()
+    return name.translate(_SAFE_TABLE).strip()
 
 def _resize_image(img: Image.Image, pct: int) -> Image.Image:
     w, h = img.size
     new_size: Tuple[int, int] = (max(1, w * pct // 100), max(1, h * pct // 100))
-    return img.resize(new_size, Image.Resampling.LANCZOS)
+    # JPEG: decode at a reduced scale (2x headroom)
+    img.draft(None, (new_size[0] * 2, new_size[1] * 2))
+    # reduce() can't handle 16-bit modes
+    reducing_gap = None if img.mode in _NO_REDUCE_MODES else 3.0
+    return img.resize(new_size, Image.Resampling.LANCZOS, reducing_gap=reducing_gap)
 
 def _infer_format_from_name(name: str) -> str:
-    # Map common extensions to PIL save formats; default to PNG
+    # Default to PNG for unknown extensions
     ext = name.split(".")[-1].lower() if "." in name else ""
-    return {
-        "jpg": "JPEG",
-        "jpeg": "JPEG",
-        "png": "PNG",
-        "webp": "WEBP",
-        "bmp": "BMP",
-        "tif": "TIFF",
-        "tiff": "TIFF",
-    }.get(ext, "PNG")
+    return _FMT_MAP.get(ext, "PNG")
+
+def _process_file(f, pct: int) -> Tuple[str, bytes]:
+    # Runs in a worker thread (Pillow releases the GIL while decoding/resizing/encoding).
+    # No Streamlit calls in here; errors are reported by the caller.
+    img = Image.open(io.BytesIO(f.getvalue()))
+    # Convert paletted/with alpha handling for JPEG if needed
+    fmt = _infer_format_from_name(f.name)
+    resized = _resize_image(img, pct)
+
+    out_bytes = io.BytesIO()
+    save_kwargs = {}
+    if fmt == "JPEG":
+        # Ensure RGB for JPEG (no alpha)
+        if resized.mode in ("RGBA", "LA", "P"):
+            resized = resized.convert("RGB")
+        save_kwargs.update({"quality": 90, "optimize": True, "progressive": True})
+    resized.save(out_bytes, format=fmt, **save_kwargs)
+
+    base = _safe_name(f.name.rsplit(".", 1)[0]) if "." in f.name else _safe_name(f.name)
+    ext = (fmt.lower() if fmt != "JPEG" else "jpg")
+    arcname = f"{base}_{pct}pct.{ext}"
+    return arcname, out_bytes.getvalue()
+
+def _build_zip(files, pct: int) -> Tuple[io.BytesIO, int]:
+    # Runs on the main thread; workers only encode, entries are written here in upload order
+    error_count = 0
+    # Passed to download_button without copying
+    zip_buffer = io.BytesIO()
+    max_workers = min(_MAX_WORKERS, os.cpu_count() or 1, len(files))
+    with zipfile.ZipFile(zip_buffer, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [(f, pool.submit(_process_file, f, pct)) for f in files]
+            for f, fut in futures:
+                try:
+                    arcname, data = fut.result()
+                    compress_type = zipfile.ZIP_STORED if arcname.endswith(_STORED_EXTS) else zipfile.ZIP_DEFLATED
+                    zf.writestr(arcname, data, compress_type=compress_type)
+                except Exception as e:
+                    error_count += 1
+                    st.error(f"Failed to process {f.name}: {e}")
+    return zip_buffer, error_count
+
+@st.cache_data(show_spinner=False, max_entries=300)
+def _preview_thumbnail(data: bytes) -> Image.Image:
+    # Cached on the file bytes, so reruns (slider moves, button clicks) don't re-decode every upload
+    img = Image.open(io.BytesIO(data))
+    img.thumbnail((240, 240))
+    return img
 
 # Preview thumbnails (optional)
 if uploaded_files:
@@ -52,58 +121,29 @@ if uploaded_files:
     for i, f in enumerate(uploaded_files):
         with cols[i % len(cols)]:
             try:
-                img = Image.open(f)
-                img.thumbnail((240, 240))
+                img = _preview_thumbnail(f.getvalue())
                 st.image(img, caption=_safe_name(f.name), width='content')
             except Exception as e:
                 st.error(f"Could not preview {f.name}: {e}")
 
 process = st.button("⚙️ Process & prepare ZIP")
 
-zip_bytes = None
+zip_buffer = None
 error_count = 0
 
 if process:
     if not uploaded_files:
         st.warning("Please upload at least one image.")
     else:
-        buffer = io.BytesIO()
-        with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-            for f in uploaded_files:
-                try:
-                    f.seek(0)
-                    img = Image.open(f)
-                    # Convert paletted/with alpha handling for JPEG if needed
-                    fmt = _infer_format_from_name(f.name)
-                    resized = _resize_image(img, pct)
-
-                    out_bytes = io.BytesIO()
-                    save_kwargs = {}
-                    if fmt == "JPEG":
-                        # Ensure RGB for JPEG (no alpha)
-                        if resized.mode in ("RGBA", "LA", "P"):
-                            resized = resized.convert("RGB")
-                        save_kwargs.update({"quality": 90, "optimize": True})
-                    resized.save(out_bytes, format=fmt, **save_kwargs)
-                    out_bytes.seek(0)
-
-                    base = _safe_name(f.name.rsplit(".", 1)[0]) if "." in f.name else _safe_name(f.name)
-                    ext = (fmt.lower() if fmt != "JPEG" else "jpg")
-                    arcname = f"{base}_{pct}pct.{ext}"
-                    zf.writestr(arcname, out_bytes.read())
-                except Exception as e:
-                    error_count += 1
-                    st.error(f"Failed to process {f.name}: {e}")
-        buffer.seek(0)
-        zip_bytes = buffer.read()
+        zip_buffer, error_count = _build_zip(uploaded_files, pct)
 
-if zip_bytes:
+if zip_buffer is not None:
     timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
     filename = f"resized_{pct}pct_{timestamp}.zip"
     st.success(f"Done! {len(uploaded_files) - error_count} file(s) processed.")
     st.download_button(
         "⬇️ Download ZIP",
-        data=zip_bytes,
+        data=zip_buffer,
         file_name=filename,
         mime="application/zip",
         use_container_width=True,